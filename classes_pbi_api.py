@@ -1,8 +1,66 @@
 import pandas as pd
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import msal
-from openpyxl import load_workbook
+import ijson
+import json
+from openpyxl import Workbook
+from concurrent.futures import ThreadPoolExecutor
 import os
+import time
+
+
+_BASE = "https://api.powerbi.com/v1.0/myorg"
+
+
+def _run_async(coro):
+    """
+    Runs a coroutine to completion from synchronous code.
+
+    Falls back to a worker thread when an event loop is already running (e.g. in Jupyter).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+class _HeadReader:
+    """
+    File-like wrapper that keeps the first bytes read from a stream, so a short response can be re-parsed.
+    """
+    def __init__(self, stream, limit: int = 1024 * 1024):
+        self._stream = stream
+        self._limit = limit
+        self.head = bytearray()
+
+    def read(self, size: int = -1):
+        data = self._stream.read(size)
+        if len(self.head) < self._limit:
+            self.head += data[:self._limit - len(self.head)]
+        return data
+
+
+class _PowerBIRetry(Retry):
+    """
+    Retry policy that retries refresh POSTs only on 429 or connection errors.
+
+    Repeating a refresh POST after a 5xx or read error can queue a second refresh, so those are not retried.
+    """
+    def increment(self, method=None, url=None, response=None, error=None, *args, **kwargs):
+        is_refresh_post = method == 'POST' and url is not None and url.split('?')[0].endswith('/refreshes')
+        is_throttled = response is not None and response.status == 429
+        is_not_sent = error is not None and self._is_connection_error(error)
+
+        if is_refresh_post and not (is_throttled or is_not_sent):
+            # Give up immediately, as an exhausted retry policy would
+            return super(_PowerBIRetry, self.new(total=0)).increment(method, url, response, error, *args, **kwargs)
+        return super().increment(method, url, response, error, *args, **kwargs)
 
 
 class PBIManager():
@@ -17,6 +75,11 @@ class PBIManager():
             access_token (str or None): Access token for API requests.
             authority (str): Authority URL for authentication.
         """
+    _DATASETS_URL = _BASE + "/groups/{ws}/datasets"
+    _REPORTS_URL = _BASE + "/groups/{ws}/reports"
+    _EXEC_URL = _BASE + "/datasets/{ds}/executeQueries"
+    _REFRESH_URL = _BASE + "/groups/{ws}/datasets/{ds}/refreshes"
+
     def __init__(self,tenant_id: str, client_id: str, client_secret: str, scope: str):
         """
         Initializes the PBIManager with authentication details.
@@ -34,21 +97,79 @@ class PBIManager():
         self.scope = [scope]
         self.access_token = None
         self.authority = f"https://login.microsoftonline.com/{tenant_id}"
+        self._token_expiry = 0.0
+        self._msal_app = msal.ConfidentialClientApplication(
+            client_id,
+            authority=self.authority,
+            client_credential=client_secret,
+            token_cache=msal.TokenCache()
+        )
+
+        self._session = requests.Session()
+        retries = _PowerBIRetry(
+            total=6,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({'GET', 'POST'}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self._session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=32, max_retries=retries))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the underlying HTTP session and its pooled connections.
+        """
+        self._session.close()
+
+    @staticmethod
+    def _raise_for_status(response):
+        """
+        Raises an HTTPError for an unsuccessful response after printing the error details.
+
+        Raises:
+            requests.HTTPError: If the response has a 4xx or 5xx status code.
+        """
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            print(f"❌ Error: {response.status_code} - {response.text}")
+            raise
 
     def get_token(self):
         """
-        Retrieves an access token using MSAL Confidential Client Application.
+        Retrieves an access token using the shared MSAL Confidential Client Application,
+        which serves it from its token cache while still valid.
 
         Raises:
             Exception: If the token retrieval fails.
         """
-        app = msal.ConfidentialClientApplication(self.client_id, authority=self.authority, client_credential=self.client_secret)
-
-        token_response = app.acquire_token_for_client(scopes= self.scope)
+        token_response = self._msal_app.acquire_token_for_client(scopes= self.scope)
         self.access_token = token_response.get('access_token')
 
         if not self.access_token:
             raise Exception('❌ Failed to retrieve the token')
+
+        # Refresh 5 minutes before the token actually expires
+        self._token_expiry = time.monotonic() + int(token_response.get('expires_in', 0)) - 300
+        self._session.headers.update({"Authorization": f"Bearer {self.access_token}"})
+
+    def _ensure_token(self):
+        """
+        Returns a valid access token, acquiring a new one only if the cached token has expired.
+
+        Returns:
+            str: The access token.
+        """
+        if self.access_token is None or time.monotonic() >= self._token_expiry:
+            self.get_token()
+        return self.access_token
         
     def get_list_of_datasets(self, workspace_id: str):
         """
@@ -61,23 +182,23 @@ class PBIManager():
             pd.DataFrame: A DataFrame containing dataset IDs and names.
 
         Raises:
-            Exception: If no access token is available.
+            Exception: If the token retrieval or the API request fails.
         """
-        if self.access_token is None:
-            raise Exception('❌ No access token, call "get_token()"')
+        self._ensure_token()
         
-        url = f"https://api.powerbi.com/v1.0/myorg/groups/{workspace_id}/datasets"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-        response = requests.get(url, headers=headers)
-
-        if response.status_code == 200:
-            data = response.json()
-            datasets = data.get('value',[])
-
-            df = pd.DataFrame(datasets, columns=['id', 'name'])
-            return df 
-        else:
-            raise Exception(f"❌ Error: {response.status_code} - {response.text}")
+        url = self._DATASETS_URL.format(ws=workspace_id)
+        response = self._session.get(url)
+
+        self._raise_for_status(response)
+
+        data = response.json()
+        datasets = data.get('value',[])
+
+        df = pd.DataFrame({
+            'id': [item.get('id') for item in datasets],
+            'name': [item.get('name') for item in datasets]
+        })
+        return df
         
     def get_list_of_reports(self, workspace_id: str):
         """
@@ -90,24 +211,23 @@ class PBIManager():
             pd.DataFrame: A DataFrame containing report IDs and names.
 
         Raises:
-            Exception: If no access token is available.
+            Exception: If the token retrieval or the API request fails.
         """
-        if self.access_token is None:
-            raise Exception('❌ No access token, call "get_token()"')
+        self._ensure_token()
         
-        url = f"https://api.powerbi.com/v1.0/myorg/groups/{workspace_id}/reports" 
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-        response = requests.get(url, headers=headers)
-
-        if response.status_code == 200:
-            data = response.json()
-            reports = data.get('value', [])
-
-            df = pd.DataFrame(reports, columns=['id', 'name'])
-            return df
-     
-        else:
-            raise Exception(f"❌ Error: {response.status_code} - {response.text}")
+        url = self._REPORTS_URL.format(ws=workspace_id)
+        response = self._session.get(url)
+
+        self._raise_for_status(response)
+
+        data = response.json()
+        reports = data.get('value', [])
+
+        df = pd.DataFrame({
+            'id': [item.get('id') for item in reports],
+            'name': [item.get('name') for item in reports]
+        })
+        return df
         
     def get_reports_with_datasets(self, workspace_id: str):
         """
@@ -120,45 +240,36 @@ class PBIManager():
             pd.DataFrame: A DataFrame containing report IDs, names, dataset IDs, and dataset names.
 
         Raises:
-            Exception: If no access token is available.
+            Exception: If the token retrieval or the API request fails.
         """
-        if self.access_token is None:
-            raise Exception('❌ No access token, call "get_token()"')
+        self._ensure_token()
         
-        url = f"https://api.powerbi.com/v1.0/myorg/groups/{workspace_id}/reports"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-        response = requests.get(url, headers=headers)
-
-        if response.status_code == 200:
-            data = response.json()
-            reports = data.get('value', [])
-
-            report_list = []
-            for report in reports:
-                report_id = report.get('id')
-                report_name = report.get('name')
-                dataset_id = report.get('datasetId')
-                
-                
-                dataset_name = None
-                if dataset_id:
-                    dataset_url = f"https://api.powerbi.com/v1.0/myorg/groups/{workspace_id}/datasets/{dataset_id}"
-                    dataset_response = requests.get(dataset_url, headers=headers)
-                    if dataset_response.status_code == 200:
-                        dataset_data = dataset_response.json()
-                        dataset_name = dataset_data.get('name')
-                
-                report_list.append({
-                    'report_id': report_id,
-                    'report_name': report_name,
-                    'dataset_id': dataset_id,
-                    'dataset_name': dataset_name
-                })
-
-            df = pd.DataFrame(report_list, columns=['report_id', 'report_name', 'dataset_id', 'dataset_name'])
-            return df
-        else:
-            raise Exception(f"❌ Error: {response.status_code} - {response.text}")
+        url = self._REPORTS_URL.format(ws=workspace_id)
+        response = self._session.get(url)
+
+        self._raise_for_status(response)
+
+        data = response.json()
+        reports = data.get('value', [])
+
+        df_datasets = self.get_list_of_datasets(workspace_id)
+        id_to_name = dict(zip(df_datasets['id'], df_datasets['name']))
+
+        report_ids, report_names, dataset_ids, dataset_names = [], [], [], []
+        for report in reports:
+            dataset_id = report.get('datasetId')
+            report_ids.append(report.get('id'))
+            report_names.append(report.get('name'))
+            dataset_ids.append(dataset_id)
+            dataset_names.append(id_to_name.get(dataset_id))
+
+        df = pd.DataFrame({
+            'report_id': report_ids,
+            'report_name': report_names,
+            'dataset_id': dataset_ids,
+            'dataset_name': dataset_names
+        })
+        return df
         
     def execute_query(self, query_input: str, dataset_id: str):
         """
@@ -172,75 +283,242 @@ class PBIManager():
             pd.DataFrame: A DataFrame containing the query results.
 
         Raises:
-            Exception: If no access token is available or if an API request fails.
+            Exception: If the token retrieval or the API request fails.
         """
+        columns, rows = self._execute_query_raw(query_input, dataset_id)
+        return pd.DataFrame.from_records(rows, columns=columns)
 
-        if self.access_token is None:
-            raise Exception('❌ No access token, call "get_token()"')
+    def _execute_query_raw(self, query_input: str, dataset_id: str):
+        """
+        Executes a query against a Power BI dataset and streams the result rows.
+
+        The rows are parsed incrementally from the response instead of loading the whole JSON body first.
+
+        Returns:
+            tuple: The list of column names and a generator of row value lists.
+        """
+        self._ensure_token()
         
-        url = f"https://api.powerbi.com/v1.0/myorg/datasets/{dataset_id}/executeQueries"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.access_token}"
-        }
+        url = self._EXEC_URL.format(ds=dataset_id)
 
+        # includeNulls keeps every column in every row, so the first row defines the columns
         query = {
             "queries": [{
                 "query": f'{query_input}'
-            }]
+            }],
+            "serializerSettings": {
+                "includeNulls": True
+            }
         }
 
-        response = requests.post(url, headers=headers, json=query)
-
-        if response.status_code == 200:
-            result_json = response.json()
-
-            try:
-                data = result_json['results'][0]['tables'][0]['rows']
-                df = pd.DataFrame(data)
-                return df
-            
-            except Exception as e:
-                print(f'❌ Error: {e}')
-                raise
-        else:
-            raise Exception(f"❌ Error: {response.status_code} - {response.text}")
+        response = self._session.post(url, json=query, stream=True)
+
+        self._raise_for_status(response)
+
+        response.raw.decode_content = True
+        raw = _HeadReader(response.raw)
+        row_items = ijson.items(raw, 'results.item.tables.item.rows.item', use_float=True)
+
+        try:
+            first_row = next(row_items, None)
+
+            # Without rows the body is small (an error, a missing table or an empty table),
+            # so check its buffered start for the cause
+            if first_row is None:
+                result_json = json.loads(raw.head)
+                if 'error' in result_json:
+                    raise Exception(f"Query failed: {result_json['error']}")
+
+                result = result_json['results'][0]
+                if 'error' in result:
+                    raise Exception(f"Query failed: {result['error']}")
+
+                # Raises KeyError if there is no result table
+                result['tables'][0]['rows']
+        except Exception as e:
+            response.close()
+            print(f'❌ Error: {e}')
+            raise
+
+        # The result table is present but has no rows
+        if first_row is None:
+            response.close()
+            return [], iter(())
+
+        columns = list(first_row)
+
+        def rows():
+            with response:
+                yield [first_row.get(column) for column in columns]
+                for row in row_items:
+                    yield [row.get(column) for column in columns]
+
+        return columns, rows()
         
     def get_documentation(self, dataset_id, path_to_save):
         doc_var_list = ['columns','tables','measures','relations']
 
-        if self.access_token is None:
-            raise Exception('❌ No access token, call "get_token()"')
+        self._ensure_token()
         
         file_name = f"Documentation_{dataset_id}.xlsx"
         file_path = os.path.join(path_to_save, file_name)
         
-        with pd.ExcelWriter(file_path, mode='w', engine='openpyxl') as writer:
-            for word in doc_var_list:
-                query_word = f"""
-                EVALUATE
-                Info_{word}
-                """
-                df = self.execute_query(query_input=query_word, dataset_id=dataset_id)
-                df.to_excel(writer, sheet_name=word, index=False)
+        def fetch_table(word):
+            # Read the whole response in the worker, so the downloads overlap and
+            # no response is left open if another query fails
+            columns, rows = self._execute_query_raw(f"EVALUATE Info_{word}", dataset_id)
+            return columns, list(rows)
+
+        # The executeQueries endpoint accepts only one query per request, so the
+        # Info_* tables are queried concurrently instead of being batched.
+        with ThreadPoolExecutor(max_workers=len(doc_var_list)) as executor:
+            futures = {word: executor.submit(fetch_table, word) for word in doc_var_list}
+            doc_results = {word: future.result() for word, future in futures.items()}
+
+        workbook = Workbook(write_only=True)
+        for word, (columns, rows) in doc_results.items():
+            sheet = workbook.create_sheet(word)
+            sheet.append(columns)
+            for row in rows:
+                sheet.append(row)
+        workbook.save(file_path)
         print(f'✅ Documentation saved at: {file_path}')
 
 
-    def refresh_dataset(self, workspace_id: str, dataset_id: str):
+    def refresh_dataset(self, workspace_id: str, dataset_id: str, wait: bool = False, timeout: float = 3600):
         """
         Triggers a refresh for a specific dataset in Power BI.
+
+        Args:
+            workspace_id (str): The ID of the Power BI workspace.
+            dataset_id (str): The ID of the Power BI dataset.
+            wait (bool): Whether to wait until the refresh finishes.
+            timeout (float): Maximum number of seconds to wait for the refresh to finish.
+
+        Returns:
+            str: The final refresh status if waiting, otherwise 'Started'.
+
+        Raises:
+            Exception: If the token retrieval or the API request fails.
         """
-        if self.access_token is None:
-            raise Exception('❌ No access token, call "get_token()"')
-        
-        url = f"https://api.powerbi.com/v1.0/myorg/groups/{workspace_id}/datasets/{dataset_id}/refreshes"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-        response = requests.post(url, headers=headers)
-        
-        if response.status_code == 202:
-            print(f'✅ Refresh started for dataset: {dataset_id}')
-        else:
-            raise Exception(f"❌ Error: {response.status_code} - {response.text}")
\ No newline at end of file
+        self._ensure_token()
+
+        result = _run_async(self.refresh_datasets(workspace_id, [dataset_id], wait=wait, timeout=timeout))[dataset_id]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def refresh_datasets(self, workspace_id: str, dataset_ids: list, poll_interval: float = 15, max_poll_interval: float = 120, wait: bool = True, timeout: float = 3600):
+        """
+        Triggers refreshes for multiple datasets concurrently and optionally polls until they finish.
+
+        The HTTP calls run on the shared session in worker threads, so they use the same retry policy as the other methods.
+
+        Args:
+            workspace_id (str): The ID of the Power BI workspace.
+            dataset_ids (list): The IDs of the Power BI datasets.
+            poll_interval (float): Initial number of seconds between status checks, increased by 1.5x after each check.
+            max_poll_interval (float): Upper bound for the number of seconds between status checks.
+            wait (bool): Whether to wait until the refreshes finish.
+            timeout (float): Maximum number of seconds to wait for each refresh to finish.
+
+        Returns:
+            dict: A mapping of dataset IDs to their final refresh status ('Completed', 'Failed', ...) if waiting,
+                otherwise 'Started'. Datasets whose request failed map to the raised exception.
+        """
+        # MSAL token acquisition is a blocking network call, keep it off the event loop
+        await asyncio.to_thread(self._ensure_token)
+        semaphore = asyncio.Semaphore(16)
+
+        started = await asyncio.gather(
+            *[self._run_limited(semaphore, self._start_refresh, workspace_id, dataset_id) for dataset_id in dataset_ids],
+            return_exceptions=True
+        )
+        results = {dataset_id: (result if isinstance(result, Exception) else 'Started') for dataset_id, result in zip(dataset_ids, started)}
+        if not wait:
+            return results
+
+        pending = {dataset_id: request_id for dataset_id, request_id in zip(dataset_ids, started) if not isinstance(request_id, Exception)}
+        statuses = await asyncio.gather(
+            *[
+                self._poll_refresh(semaphore, workspace_id, dataset_id, request_id, poll_interval, max_poll_interval, timeout)
+                for dataset_id, request_id in pending.items()
+            ],
+            return_exceptions=True
+        )
+        results.update(zip(pending, statuses))
+        return results
+
+    @staticmethod
+    async def _run_limited(semaphore, func, *args):
+        """
+        Runs a blocking function in a worker thread, limited by the given semaphore.
+        """
+        async with semaphore:
+            return await asyncio.to_thread(func, *args)
+
+    def _start_refresh(self, workspace_id: str, dataset_id: str):
+        """
+        Triggers a refresh for a single dataset.
+
+        Returns:
+            str: The ID of the started refresh, used to find it in the refresh history.
+        """
+        self._ensure_token()
+
+        url = self._REFRESH_URL.format(ws=workspace_id, ds=dataset_id)
+        response = self._session.post(url)
+
+        self._raise_for_status(response)
+
+        print(f'✅ Refresh started for dataset: {dataset_id}')
+        return response.headers.get('RequestId')
+
+    def _get_refresh_history(self, workspace_id: str, dataset_id: str, top: int):
+        """
+        Fetches the most recent refreshes of a dataset.
+
+        Returns:
+            list: The refresh history entries, newest first.
+        """
+        # Re-check the token on each poll, long refreshes can outlive it
+        self._ensure_token()
+
+        url = self._REFRESH_URL.format(ws=workspace_id, ds=dataset_id)
+        response = self._session.get(url, params={'$top': top})
+
+        self._raise_for_status(response)
+
+        return response.json().get('value', [])
+
+    async def _poll_refresh(self, semaphore, workspace_id: str, dataset_id: str, request_id: str, poll_interval: float, max_poll_interval: float, timeout: float):
+        """
+        Polls the refresh history of a dataset until the given refresh reaches a final status.
+
+        Returns:
+            str: The final refresh status.
+
+        Raises:
+            TimeoutError: If the refresh does not finish within the timeout.
+        """
+        if request_id is None:
+            raise Exception(f'❌ No RequestId returned for the refresh of dataset: {dataset_id}')
+
+        deadline = time.monotonic() + timeout
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f'❌ Refresh of dataset {dataset_id} did not finish within {timeout} seconds')
+
+            await asyncio.sleep(min(poll_interval, remaining))
+            poll_interval = min(poll_interval * 1.5, max_poll_interval)
+
+            # The new refresh may not be listed yet, so match it by its request ID
+            refreshes = await self._run_limited(semaphore, self._get_refresh_history, workspace_id, dataset_id, 10)
+            status = next((refresh.get('status') for refresh in refreshes if refresh.get('requestId') == request_id), None)
+
+            # 'Unknown' means the refresh is still in progress
+            if status in ('Completed', 'Failed', 'Disabled', 'Cancelled'):
+                print(f'{"✅" if status == "Completed" else "❌"} Refresh {status.lower()} for dataset: {dataset_id}')
+                return status